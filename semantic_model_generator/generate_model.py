@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 from snowflake.connector import SnowflakeConnection
@@ -14,7 +14,8 @@ from semantic_model_generator.snowflake_utils.snowflake_connector import (
     OBJECT_DATATYPES,
     TIME_MEASURE_DATATYPES,
     get_table_representation,
-    get_valid_schemas_tables_columns_df,
+    iter_tables,
+    iter_valid_schemas_tables_columns,
 )
 from semantic_model_generator.snowflake_utils.utils import create_fqn_table
 from semantic_model_generator.validate.context_length import validate_context_length
@@ -143,7 +144,7 @@ def _raw_table_to_semantic_context_table(
             )
     if len(time_dimensions) + len(dimensions) + len(measures) == 0:
         raise ValueError(
-            f"No valid columns found for table {raw_table.name}. Please verify that this table contains column's datatypes not in {OBJECT_DATATYPES}."
+            f"No valid columns found for table {raw_table.name}. Please verify that this table contains column's datatypes not in {sorted(OBJECT_DATATYPES)}."
         )
 
     return semantic_model_pb2.Table(
@@ -190,39 +191,46 @@ def raw_schema_to_semantic_context(
 
     # For FQN tables, create a new snowflake connection per table in case the db/schema is different.
     table_objects = []
-    unique_database_schema: List[str] = []
-    for table in base_tables:
-        # Verify this is a valid FQN table. For now, we check that the table follows the following format.
-        # {database}.{schema}.{table}
-        fqn_table = create_fqn_table(table)
-        fqn_databse_schema = f"{fqn_table.database}.{fqn_table.schema_name}"
-
-        if fqn_databse_schema not in unique_database_schema:
-            unique_database_schema.append(fqn_databse_schema)
-
-        logger.info(f"Pulling column information from {fqn_table}")
-        valid_schemas_tables_columns_df = get_valid_schemas_tables_columns_df(
+    # Verify these are valid FQN tables. For now, we check that the tables follow the following format.
+    # {database}.{schema}.{table}
+    fqn_tables = [create_fqn_table(table) for table in base_tables]
+
+    # Pull the columns of all tables in a schema with one query, and build each table as soon
+    # as its columns have been downloaded.
+    table_names_by_schema: Dict[Tuple[str, str], List[str]] = {}
+    for fqn_table in fqn_tables:
+        table_names_by_schema.setdefault(
+            (fqn_table.database, fqn_table.schema_name), []
+        ).append(fqn_table.table)
+    raw_tables: Dict[Tuple[str, str, str], data_types.Table] = {}
+    for (database, schema_name), table_names in table_names_by_schema.items():
+        logger.info(f"Pulling column information from {database}.{schema_name}")
+        fqn_databse_schema = f"{database}.{schema_name}"
+        for page in iter_valid_schemas_tables_columns(
             conn=conn,
-            db_name=fqn_table.database,
-            table_schema=fqn_table.schema_name,
-            table_names=[fqn_table.table],
-        )
-        assert not valid_schemas_tables_columns_df.empty
-
-        # get the valid columns for this table.
-        valid_columns_df_this_table = valid_schemas_tables_columns_df[
-            valid_schemas_tables_columns_df["TABLE_NAME"] == fqn_table.table
-        ]
+            db_name=database,
+            table_schema=schema_name,
+            table_names=table_names,
+        ):
+            for table_schema, table_name, table_columns in iter_tables(page):
+                # The catalog matches the schema case-insensitively, so the key does too.
+                raw_tables[(database, table_schema.upper(), table_name)] = (
+                    get_table_representation(
+                        conn=conn,
+                        schema_name=fqn_databse_schema,  # Fully-qualified schema
+                        table_name=table_name,  # Non-qualified table name
+                        table_index=0,
+                        ndv_per_column=n_sample_values,  # number of sample values to pull per column.
+                        columns_df=table_columns,
+                        max_workers=1,
+                    )
+                )
 
-        raw_table = get_table_representation(
-            conn=conn,
-            schema_name=fqn_databse_schema,  # Fully-qualified schema
-            table_name=fqn_table.table,  # Non-qualified table name
-            table_index=0,
-            ndv_per_column=n_sample_values,  # number of sample values to pull per column.
-            columns_df=valid_columns_df_this_table,
-            max_workers=1,
+    for fqn_table in fqn_tables:
+        raw_table = raw_tables.get(
+            (fqn_table.database, fqn_table.schema_name.upper(), fqn_table.table)
         )
+        assert raw_table is not None, f"No columns found for table {fqn_table}"
         table_object = _raw_table_to_semantic_context_table(
             database=fqn_table.database,
             schema=fqn_table.schema_name,
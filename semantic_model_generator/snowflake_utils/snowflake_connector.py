@@ -1,13 +1,20 @@
+import atexit
 import concurrent.futures
+import queue
+import threading
+import time
+import weakref
 from collections import defaultdict
 from contextlib import contextmanager
-from typing import Any, Dict, Generator, List, Optional, TypeVar
+from typing import Any, Dict, Generator, List, Optional, Tuple, TypeVar, Union
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from loguru import logger
-from snowflake.connector import DictCursor
 from snowflake.connector.connection import SnowflakeConnection
-from snowflake.connector.errors import ProgrammingError
+from snowflake.connector.cursor import SnowflakeCursor
+from snowflake.connector.errors import NotSupportedError, ProgrammingError
 
 from semantic_model_generator.data_processing.data_types import Column, Table
 from semantic_model_generator.snowflake_utils import env_vars
@@ -27,65 +34,81 @@ _TABLE_NAME_COL = "TABLE_NAME"
 # Below are the renamed column names when we fetch into dataframe, to differentiate between table/column comments
 _COLUMN_COMMENT_ALIAS = "COLUMN_COMMENT"
 _TABLE_COMMENT_COL = "TABLE_COMMENT"
+# Column names of the batched sample values query.
+_COLUMN_INDEX_ALIAS = "COLUMN_INDEX"
+_COLUMN_VALUE_ALIAS = "COLUMN_VALUE"
+_COLUMN_RANK_ALIAS = "COLUMN_RANK"
 
 # https://docs.snowflake.com/en/sql-reference/data-types-datetime
-TIME_MEASURE_DATATYPES = [
-    "DATE",
-    "DATETIME",
-    "TIMESTAMP_LTZ",
-    "TIMESTAMP_NTZ",
-    "TIMESTAMP_TZ",
-    "TIMESTAMP",
-    "TIME",
-]
+TIME_MEASURE_DATATYPES = frozenset(
+    {
+        "DATE",
+        "DATETIME",
+        "TIMESTAMP_LTZ",
+        "TIMESTAMP_NTZ",
+        "TIMESTAMP_TZ",
+        "TIMESTAMP",
+        "TIME",
+    }
+)
 # https://docs.snowflake.com/en/sql-reference/data-types-text
-DIMENSION_DATATYPES = [
-    "VARCHAR",
-    "CHAR",
-    "CHARACTER",
-    "NCHAR",
-    "STRING",
-    "TEXT",
-    "NVARCHAR",
-    "NVARCHAR2",
-    "CHAR VARYING",
-    "NCHAR VARYING",
-    "BINARY",
-    "VARBINARY",
-]
+DIMENSION_DATATYPES = frozenset(
+    {
+        "VARCHAR",
+        "CHAR",
+        "CHARACTER",
+        "NCHAR",
+        "STRING",
+        "TEXT",
+        "NVARCHAR",
+        "NVARCHAR2",
+        "CHAR VARYING",
+        "NCHAR VARYING",
+        "BINARY",
+        "VARBINARY",
+    }
+)
 # https://docs.snowflake.com/en/sql-reference/data-types-numeric
-MEASURE_DATATYPES = [
-    "NUMBER",
-    "DECIMAL",
-    "DEC",
-    "NUMERIC",
-    "INT",
-    "INTEGER",
-    "BIGINT",
-    "SMALLINT",
-    "TINYINT",
-    "BYTEINT",
-    "FLOAT",
-    "FLOAT4",
-    "FLOAT8",
-    "DOUBLE",
-    "DOUBLE PRECISION",
-    "REAL",
-]
-OBJECT_DATATYPES = ["VARIANT", "ARRAY", "OBJECT", "GEOGRAPHY"]
+MEASURE_DATATYPES = frozenset(
+    {
+        "NUMBER",
+        "DECIMAL",
+        "DEC",
+        "NUMERIC",
+        "INT",
+        "INTEGER",
+        "BIGINT",
+        "SMALLINT",
+        "TINYINT",
+        "BYTEINT",
+        "FLOAT",
+        "FLOAT4",
+        "FLOAT8",
+        "DOUBLE",
+        "DOUBLE PRECISION",
+        "REAL",
+    }
+)
+OBJECT_DATATYPES = frozenset({"VARIANT", "ARRAY", "OBJECT", "GEOGRAPHY"})
+# Sample values of these datatypes are either not useful or too large to pull.
+_UNSAMPLED_DATATYPES = OBJECT_DATATYPES | {"BINARY", "VARBINARY", "VECTOR"}
+# Sample values are truncated to this many characters before leaving Snowflake.
+_MAX_SAMPLE_VALUE_LENGTH = 256
 
 
 _QUERY_TAG = "SEMANTIC_MODEL_GENERATOR"
+# Pooled connections idle for longer than this are closed instead of reused.
+_POOL_IDLE_TIMEOUT_SEC = 600
 
 
 def _get_table_comment(
     conn: SnowflakeConnection,
     schema_name: str,
     table_name: str,
-    columns_df: pd.DataFrame,
+    table_comment: Optional[str],
 ) -> str:
-    if columns_df[_TABLE_COMMENT_COL].iloc[0]:
-        return columns_df[_TABLE_COMMENT_COL].iloc[0]  # type: ignore[no-any-return]
+    if table_comment:
+        return table_comment
     else:
         # auto-generate table comment if it is not provided.
         try:
@@ -105,16 +128,21 @@ def _get_table_comment(
 
 
 def _get_column_comment(
-    conn: SnowflakeConnection, column_row: pd.Series, column_values: Optional[List[str]]
+    conn: SnowflakeConnection,
+    table_name: str,
+    column_name: str,
+    column_datatype: str,
+    column_comment: Optional[str],
+    column_values: Optional[List[str]],
 ) -> str:
-    if column_row[_COLUMN_COMMENT_ALIAS]:
-        return column_row[_COLUMN_COMMENT_ALIAS]  # type: ignore[no-any-return]
+    if column_comment:
+        return column_comment
     else:
         # auto-generate column comment if it is not provided.
         try:
-            comment_prompt = f"""Here is column from table {column_row['TABLE_NAME']}:
-name: {column_row['COLUMN_NAME']};
-type: {column_row['DATA_TYPE']};
+            comment_prompt = f"""Here is column from table {table_name}:
+name: {column_name};
+type: {column_datatype};
 values: {';'.join(column_values) if column_values else ""};
 Please provide a business description for the column. Only return the description without any other text."""
             comment_prompt = comment_prompt.replace("'", "\\'")
@@ -145,32 +173,49 @@ def get_table_representation(
     table_name: str,
     table_index: int,
     ndv_per_column: int,
-    columns_df: pd.DataFrame,
+    columns_df: Union[pa.Table, pd.DataFrame],
     max_workers: int,
 ) -> Table:
-    table_comment = _get_table_comment(conn, schema_name, table_name, columns_df)
+    if isinstance(columns_df, pd.DataFrame):
+        columns_df = pa.Table.from_pandas(columns_df, preserve_index=False)
+    # Read the columns straight from Arrow into Python lists, without building rows.
+    names = columns_df.column(_COLUMN_NAME_COL).to_pylist()
+    comments = columns_df.column(_COLUMN_COMMENT_ALIAS).to_pylist()
+    dtypes = columns_df.column(_DATATYPE_COL).to_pylist()
+
+    table_comment = _get_table_comment(
+        conn, schema_name, table_name, columns_df.column(_TABLE_COMMENT_COL)[0].as_py()
+    )
+    column_values = _get_column_values(
+        conn=conn,
+        schema_name=schema_name,
+        table_name=table_name,
+        column_names=names,
+        column_datatypes=dtypes,
+        ndv=ndv_per_column,
+    )
 
-    def _get_col(col_index: int, column_row: pd.Series) -> Column:
+    def _get_col(
+        col_index: int,
+        column_name: str,
+        column_comment: Optional[str],
+        column_datatype: str,
+    ) -> Column:
         return _get_column_representation(
             conn=conn,
-            schema_name=schema_name,
             table_name=table_name,
-            column_row=column_row,
+            column_name=column_name,
+            column_comment=column_comment,
+            column_datatype=column_datatype,
             column_index=col_index,
-            ndv=ndv_per_column,
+            column_values=column_values.get(col_index),
         )
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_col_index = {
-            executor.submit(_get_col, col_index, column_row): col_index
-            for col_index, (_, column_row) in enumerate(columns_df.iterrows())
-        }
-        index_and_column = []
-        for future in concurrent.futures.as_completed(future_to_col_index):
-            col_index = future_to_col_index[future]
-            column = future.result()
-            index_and_column.append((col_index, column))
-        columns = [c for _, c in sorted(index_and_column, key=lambda x: x[0])]
+        # map yields results in submission order, so columns keep their table order.
+        columns = list(
+            executor.map(_get_col, range(len(names)), names, comments, dtypes)
+        )
 
     return Table(
         id_=table_index,
@@ -180,43 +225,134 @@ def get_table_representation(
     )
 
 
-def _get_column_representation(
+def _get_column_values(
     conn: SnowflakeConnection,
     schema_name: str,
     table_name: str,
-    column_row: pd.Series,
-    column_index: int,
+    column_names: List[str],
+    column_datatypes: List[str],
     ndv: int,
-) -> Column:
-    column_name = column_row[_COLUMN_NAME_COL]
-    column_datatype = column_row[_DATATYPE_COL]
-    column_values = None
-    if ndv > 0:
-        # Pull sample values.
-        try:
-            cursor = conn.cursor(DictCursor)
-            assert cursor is not None, "Cursor is unexpectedly None"
-            cursor_execute = cursor.execute(
-                f'select distinct "{column_name}" from {schema_name}.{table_name} limit {ndv}'
-            )
-            assert cursor_execute is not None, "cursor_execute should not be none "
-            res = cursor_execute.fetchall()
-            # Cast all values to string to ensure the list is json serializable.
-            # A better solution would be to identify the possible types that are not
-            # json serializable (e.g. datetime objects) and apply the appropriate casting
-            # in just those cases.
-            if len(res) > 0:
-                if isinstance(res[0], dict):
-                    col_key = [k for k in res[0].keys()][0]
-                    column_values = [str(r[col_key]) for r in res]
-                else:
-                    raise ValueError(
-                        f"Expected the first item of res to be a dict. Instead passed {res}"
-                    )
-        except Exception as e:
-            logger.error(f"unable to get values: {e}")
+) -> Dict[int, List[str]]:
+    """
+    Pulls up to ndv of the most frequent values for every column of a table in a single query.
+    APPROX_TOP_K computes them for all columns in one pass over the table, instead of a full
+    distinct per column, and the sketches are then flattened into one row per value.
+    Semi-structured, binary and vector columns are not sampled, and values are truncated to
+    _MAX_SAMPLE_VALUE_LENGTH characters. If the combined query fails, each column is queried on
+    its own so that only the failing columns go without values.
+
+    Returns: a mapping from the column's position in column_names to its sample values.
+    """
+    if ndv <= 0:
+        return {}
+
+    sampled_columns = [
+        (col_index, column_name)
+        for col_index, (column_name, column_datatype) in enumerate(
+            zip(column_names, column_datatypes)
+        )
+        if column_datatype.upper() not in _UNSAMPLED_DATATYPES
+    ]
+    if not sampled_columns:
+        return {}
+
+    values_tbl = _fetch_top_k_values(
+        conn, schema_name, table_name, sampled_columns, ndv
+    )
+    if values_tbl is None and len(sampled_columns) > 1:
+        # A single column that can't be sampled fails the whole query, so the columns are
+        # retried one query each to keep the values of the others.
+        per_column = [
+            _fetch_top_k_values(conn, schema_name, table_name, [sampled_column], ndv)
+            for sampled_column in sampled_columns
+        ]
+        fetched = [t for t in per_column if t is not None]
+        values_tbl = pa.concat_tables(fetched) if fetched else None
+    if values_tbl is None:
+        return {}
+
+    values_tbl = values_tbl.filter(pc.is_valid(values_tbl.column(_COLUMN_VALUE_ALIAS)))
+    # Neither the union nor a threaded group by keeps row order, so values are sorted by rank
+    # and grouped on a single thread to keep each list most frequent first.
+    values_tbl = values_tbl.sort_by(
+        [(_COLUMN_INDEX_ALIAS, "ascending"), (_COLUMN_RANK_ALIAS, "ascending")]
+    )
+    grouped = values_tbl.group_by(_COLUMN_INDEX_ALIAS, use_threads=False).aggregate(
+        [(_COLUMN_VALUE_ALIAS, "list")]
+    )
+    return dict(
+        zip(
+            grouped.column(_COLUMN_INDEX_ALIAS).to_pylist(),
+            grouped.column(f"{_COLUMN_VALUE_ALIAS}_list").to_pylist(),
+        )
+    )
 
-    column_comment = _get_column_comment(conn, column_row, column_values)
+
+def _fetch_top_k_values(
+    conn: SnowflakeConnection,
+    schema_name: str,
+    table_name: str,
+    sampled_columns: List[Tuple[int, str]],
+    ndv: int,
+) -> Optional[pa.Table]:
+    """
+    Runs one APPROX_TOP_K query over the given (position, name) columns of a table.
+
+    Returns: an Arrow table of column positions, frequency ranks and string values, or None if
+        the query failed.
+    """
+    top_k_cols = ", ".join(
+        f'approx_top_k(substr(to_varchar("{column_name}"), 1, {_MAX_SAMPLE_VALUE_LENGTH}), {ndv}) as top_k_{col_index}'
+        for col_index, column_name in sampled_columns
+    )
+    # Each element of an approx_top_k result is a [value, count] pair, most frequent first.
+    flattened = "\nunion all\n".join(
+        f"select {col_index} as {_COLUMN_INDEX_ALIAS}, f.index as {_COLUMN_RANK_ALIAS}, f.value[0]::varchar as {_COLUMN_VALUE_ALIAS} "
+        f"from top_k, lateral flatten(input => top_k.top_k_{col_index}) as f"
+        for col_index, _ in sampled_columns
+    )
+    query = f"""with top_k as (select {top_k_cols} from {schema_name}.{table_name})
+{flattened}"""
+
+    try:
+        cursor_execute = conn.cursor().execute(query)
+        assert cursor_execute is not None, "cursor_execute should not be none "
+        values_tbl = cursor_execute.fetch_arrow_all()
+    except Exception as e:
+        logger.error(f"unable to get values: {e}")
+        return None
+    if values_tbl is None:
+        return None
+
+    # Cast all values to string in one Arrow kernel to ensure the list is json serializable.
+    # Positions are widened too, so results of separate queries can be concatenated.
+    return pa.table(
+        {
+            _COLUMN_INDEX_ALIAS: pc.cast(
+                values_tbl.column(_COLUMN_INDEX_ALIAS), pa.int64()
+            ),
+            _COLUMN_RANK_ALIAS: pc.cast(
+                values_tbl.column(_COLUMN_RANK_ALIAS), pa.int64()
+            ),
+            _COLUMN_VALUE_ALIAS: pc.cast(
+                values_tbl.column(_COLUMN_VALUE_ALIAS), pa.string()
+            ),
+        }
+    )
+
+
+def _get_column_representation(
+    conn: SnowflakeConnection,
+    table_name: str,
+    column_name: str,
+    column_comment: Optional[str],
+    column_datatype: str,
+    column_index: int,
+    column_values: Optional[List[str]],
+) -> Column:
+    column_comment = _get_column_comment(
+        conn, table_name, column_name, column_datatype, column_comment, column_values
+    )
 
     column = Column(
         id_=column_index,
@@ -228,27 +364,19 @@ def _get_column_representation(
     return column
 
 
-def _fetch_valid_tables_and_views(
-    conn: SnowflakeConnection, db_name: str
-) -> pd.DataFrame:
-    def _get_df(query: str) -> pd.DataFrame:
-        cursor = conn.cursor().execute(query)
-        assert cursor is not None, "cursor should not be none here."
-
-        df = pd.DataFrame(
-            cursor.fetchall(), columns=[c.name for c in cursor.description]
-        )
-        return df[["name", "schema_name", "comment"]].rename(
-            columns=dict(
-                name=_TABLE_NAME_COL,
-                schema_name=_TABLE_SCHEMA_COL,
-                comment=_TABLE_COMMENT_COL,
-            )
-        )
+def _fetch_arrow_table(cursor: SnowflakeCursor) -> pa.Table:
+    """
+    Fetches the results of an executed cursor one Arrow batch at a time, and concatenates the
+    batches without copying.
+    Args:
+        cursor: SnowflakeCursor that has executed a query
 
-    tables = _get_df(f"show tables in database {db_name}")
-    views = _get_df(f"show views in database {db_name}")
-    return pd.concat([tables, views], axis=0)
+    Returns: an Arrow table with the results of the query
+    """
+    batches = list(cursor.fetch_arrow_batches())
+    if not batches:
+        return pa.table({c.name: [] for c in cursor.description})
+    return pa.concat_tables(batches, promote_options="default")
 
 
 def fetch_databases(conn: SnowflakeConnection) -> List[str]:
@@ -311,17 +439,20 @@ def fetch_tables_views_in_schema(
 
     Returns: a list of fully qualified table names.
     """
-    query = f"show tables in schema {schema_name};"
-    cursor = conn.cursor()
-    cursor.execute(query)
-    tables = cursor.fetchall()
+
+    def _fetch(query: str) -> List[Tuple[Any, ...]]:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        return cursor.fetchall()  # type: ignore[return-value]
+
+    # The two queries are independent, so run them concurrently on separate cursors.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        tables_future = executor.submit(_fetch, f"show tables in schema {schema_name};")
+        views_future = executor.submit(_fetch, f"show views in schema {schema_name};")
+        tables, views = tables_future.result(), views_future.result()
+
     # Each row in the result has columns (created_on, table_name, database_name, schema_name, ...)
     results = [f"{result[2]}.{result[3]}.{result[1]}" for result in tables]
-
-    query = f"show views in schema {schema_name};"
-    cursor = conn.cursor()
-    cursor.execute(query)
-    views = cursor.fetchall()
     # Each row in the result has columns (created_on, view_name, reserved, database_name, schema_name, ...)
     results += [f"{result[3]}.{result[4]}.{result[1]}" for result in views]
 
@@ -376,32 +507,155 @@ def get_valid_schemas_tables_columns_df(
     table_schema: Optional[str] = None,
     table_names: Optional[List[str]] = None,
 ) -> pd.DataFrame:
+    """
+    Fetches the tables, views and columns of a database as a dataframe.
+    See get_valid_schemas_tables_columns_table.
+    """
+    return get_valid_schemas_tables_columns_table(
+        conn, db_name, table_schema=table_schema, table_names=table_names
+    ).to_pandas()
+
+
+def get_valid_schemas_tables_columns_table(
+    conn: SnowflakeConnection,
+    db_name: str,
+    table_schema: Optional[str] = None,
+    table_names: Optional[List[str]] = None,
+) -> pa.Table:
+    """
+    Fetches the tables, views and columns of a database, optionally filtered to a schema and
+    to table names within it.
+    Args:
+        conn: SnowflakeConnection to run the query
+        db_name: The name of the database to look in.
+        table_schema: The schema to filter to.
+        table_names: The tables to filter to. Only applied together with table_schema.
+
+    Returns: an Arrow table with one row per column, ordered by schema, table and column position
+    """
+    query, params = _valid_schemas_tables_columns_query(
+        conn, db_name, table_schema, table_names
+    )
+    cursor_execute = conn.cursor().execute(query, params or None)
+    assert cursor_execute, "cursor_execute should not be None here"
+    return _fetch_arrow_table(cursor_execute)
+
+
+def _valid_schemas_tables_columns_query(
+    conn: SnowflakeConnection,
+    db_name: str,
+    table_schema: Optional[str],
+    table_names: Optional[List[str]],
+) -> Tuple[str, List[str]]:
+    """
+    Builds the catalog query of get_valid_schemas_tables_columns_table along with its bound
+    parameters.
+    """
     if table_names and not table_schema:
         logger.warning(
             "Provided table_name without table_schema, cannot filter to fetch the specific table"
         )
+    # Filters are bound as parameters rather than interpolated into the SQL text. With qmark
+    # binding, the text stays constant across calls and Snowflake's result cache can be hit.
+    placeholder = "%s" if conn.is_pyformat else "?"
     where_clause = ""
+    params: List[str] = []
     if table_schema:
-        where_clause += f" where t.table_schema ilike '{table_schema}' "
+        where_clause += f" where t.table_schema ilike {placeholder} "
+        params.append(table_schema)
         if table_names:
-            table_names_str = ", ".join([f"'{t.lower()}'" for t in table_names])
-            where_clause += f"AND LOWER(t.table_name) in ({table_names_str}) "
-    query = f"""select t.{_TABLE_SCHEMA_COL}, t.{_TABLE_NAME_COL}, c.{_COLUMN_NAME_COL}, c.{_DATATYPE_COL}, c.{_COMMENT_COL} as {_COLUMN_COMMENT_ALIAS}
+            placeholders = ", ".join([placeholder] * len(table_names))
+            where_clause += f"AND LOWER(t.table_name) in ({placeholders}) "
+            params.extend(t.lower() for t in table_names)
+    # information_schema.tables lists views as well as tables, so the table comment comes
+    # straight from it and no client-side filtering is needed.
+    query = f"""select t.{_TABLE_SCHEMA_COL}, t.{_TABLE_NAME_COL}, t.{_COMMENT_COL} as {_TABLE_COMMENT_COL}, c.{_COLUMN_NAME_COL}, c.{_DATATYPE_COL}, c.{_COMMENT_COL} as {_COLUMN_COMMENT_ALIAS}
 from {db_name}.information_schema.tables as t
 join {db_name}.information_schema.columns as c on t.table_schema = c.table_schema and t.table_name = c.table_name{where_clause}
 order by 1, 2, c.ordinal_position"""
-    cursor_execute = conn.cursor().execute(query)
-    assert cursor_execute, "cursor_execute should not be None here"
-    schemas_tables_columns_df = cursor_execute.fetch_pandas_all()
+    return query, params
 
-    valid_tables_and_views_df = _fetch_valid_tables_and_views(
-        conn=conn, db_name=db_name
-    )
 
-    valid_schemas_tables_columns_df = valid_tables_and_views_df.merge(
-        schemas_tables_columns_df, how="inner", on=(_TABLE_SCHEMA_COL, _TABLE_NAME_COL)
+def iter_valid_schemas_tables_columns(
+    conn: SnowflakeConnection,
+    db_name: str,
+    table_schema: Optional[str] = None,
+    table_names: Optional[List[str]] = None,
+) -> Generator[pa.Table, None, None]:
+    """
+    Fetches the tables, views and columns of a database like
+    get_valid_schemas_tables_columns_table, but yields the result one Arrow batch at a time
+    as it is downloaded, so that large catalogs never have to be held in memory at once.
+    The query runs once; the columns of a table are never split across yielded pages, so each
+    page can be passed to iter_tables.
+    Args:
+        conn: SnowflakeConnection to run the query
+        db_name: The name of the database to look in.
+        table_schema: The schema to filter to.
+        table_names: The tables to filter to. Only applied together with table_schema.
+
+    Returns: a generator of Arrow tables with one row per column, ordered by schema, table and
+        column position
+    """
+    query, params = _valid_schemas_tables_columns_query(
+        conn, db_name, table_schema, table_names
     )
-    return valid_schemas_tables_columns_df
+    cursor_execute = conn.cursor().execute(query, params or None)
+    assert cursor_execute, "cursor_execute should not be None here"
+    pending: Optional[pa.Table] = None
+    for batch in cursor_execute.fetch_arrow_batches():
+        page = (
+            batch
+            if pending is None
+            else pa.concat_tables([pending, batch], promote_options="default")
+        )
+        if not page.num_rows:
+            continue
+        # Rows are ordered by schema and table, so the last table of a batch may continue in
+        # the next one and its rows are held back until then.
+        last_table = pc.and_(
+            pc.equal(
+                page.column(_TABLE_SCHEMA_COL), page.column(_TABLE_SCHEMA_COL)[-1]
+            ),
+            pc.equal(page.column(_TABLE_NAME_COL), page.column(_TABLE_NAME_COL)[-1]),
+        )
+        split = page.num_rows - pc.sum(last_table).as_py()
+        pending = page.slice(split)
+        if split:
+            yield page.slice(0, split)
+    if pending is not None and pending.num_rows:
+        yield pending
+
+
+def iter_tables(
+    schemas_tables_columns: pa.Table,
+) -> Generator[Tuple[str, str, pa.Table], None, None]:
+    """
+    Splits the result of get_valid_schemas_tables_columns_table into one table per
+    (schema, table), in order of first appearance.
+    Rows are grouped in a single pass, rather than filtering the whole catalog once per table.
+    Args:
+        schemas_tables_columns: Arrow table with TABLE_SCHEMA and TABLE_NAME columns
+
+    Returns: a generator of (schema name, table name, the table's rows)
+    """
+    keys = schemas_tables_columns.select(
+        [_TABLE_SCHEMA_COL, _TABLE_NAME_COL]
+    ).to_pandas()
+    groups = keys.groupby([_TABLE_SCHEMA_COL, _TABLE_NAME_COL], sort=False).indices
+    for (schema_name, table_name), row_indices in groups.items():
+        yield schema_name, table_name, schemas_tables_columns.take(row_indices)
+
+
+# Connectors with a pool, whose idle connections are closed when the process exits. Held weakly
+# so that registering doesn't keep a connector alive.
+_pooled_connectors: "weakref.WeakSet[SnowflakeConnector]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_pooled_connections() -> None:
+    for connector in list(_pooled_connectors):
+        connector.close_all()
 
 
 class SnowflakeConnector:
@@ -409,9 +663,34 @@ class SnowflakeConnector:
         self,
         account_name: str,
         max_workers: int = 1,
+        pool_size: int = 0,
     ):
+        """
+        Args:
+            account_name: The Snowflake account to connect to.
+            max_workers: The number of threads used to fetch column information.
+            pool_size: The number of idle connections kept per (database, schema) for reuse
+                by connect(). If 0, every connect() opens and closes its own connection.
+        """
         self.account_name: str = account_name
         self._max_workers = max_workers
+        self._pool_size = pool_size
+        self._pool: Dict[
+            Tuple[str, Optional[str]], "queue.Queue[Tuple[SnowflakeConnection, float]]"
+        ] = defaultdict(queue.Queue)
+        self._pool_lock = threading.Lock()
+        if pool_size > 0:
+            _pooled_connectors.add(self)
+        # Env vars don't change after import, so resolve (and validate) them once here
+        # instead of on every connection.
+        self._role = self._get_role()
+        self._user = self._get_user()
+        self._password = self._get_password()
+        self._warehouse = self._get_warehouse()
+        self._host = self._get_host()
+        self._authenticator = self._get_authenticator()
+        self._mfa_passcode = self._get_mfa_passcode()
+        self._mfa_passcode_in_password = self._is_mfa_passcode_in_password()
 
     # Required env vars below
     def _get_role(self) -> str:
@@ -480,37 +759,88 @@ class SnowflakeConnector:
         with connector.connect(db_name="my_db", schema_name="my_schema") as conn:
             connector.execute(conn=conn, query="select * from table")
 
+        If the connector was created with a pool_size, the connection is returned to a pool on exit
+        and reused by later calls for the same database and schema, unless the block raised.
+
         Args:
             db_name: The name of the database to connect to.
             schema_name: The name of the schema to connect to. Primarily needed for Snowflake databases.
         """
-        conn = None
+        conn = self._acquire_connection(db_name, schema_name)
         try:
-            conn = self.open_connection(db_name, schema_name=schema_name)
             yield conn
-        finally:
-            if conn is not None:
+        except BaseException:
+            # The connection may have been left in a failed state, so it isn't reused.
+            self._close_connection(conn)
+            raise
+        self._release_connection(conn, db_name, schema_name)
+
+    def _acquire_connection(
+        self, db_name: str, schema_name: Optional[str]
+    ) -> SnowflakeConnection:
+        if self._pool_size > 0:
+            with self._pool_lock:
+                pool = self._pool[(db_name, schema_name)]
+            while True:
+                try:
+                    conn, released_at = pool.get_nowait()
+                except queue.Empty:
+                    break
+                if (
+                    not conn.is_closed()
+                    and time.monotonic() - released_at < _POOL_IDLE_TIMEOUT_SEC
+                ):
+                    return conn
+                self._close_connection(conn)
+        return self.open_connection(db_name, schema_name=schema_name)
+
+    def _release_connection(
+        self, conn: SnowflakeConnection, db_name: str, schema_name: Optional[str]
+    ) -> None:
+        if self._pool_size > 0 and not conn.is_closed():
+            with self._pool_lock:
+                pool = self._pool[(db_name, schema_name)]
+                if pool.qsize() < self._pool_size:
+                    pool.put_nowait((conn, time.monotonic()))
+                    return
+        self._close_connection(conn)
+
+    def close_all(self) -> None:
+        """Closes all idle pooled connections."""
+        with self._pool_lock:
+            pools = list(self._pool.values())
+            self._pool.clear()
+        for pool in pools:
+            while True:
+                try:
+                    conn, _ = pool.get_nowait()
+                except queue.Empty:
+                    break
                 self._close_connection(conn)
 
     def open_connection(
         self, db_name: str, schema_name: Optional[str] = None
     ) -> SnowflakeConnection:
+        session_parameters: Dict[str, Any] = {
+            "STATEMENT_TIMEOUT_IN_SECONDS": env_vars.DEFAULT_SESSION_TIMEOUT_SEC
+        }
+        if _QUERY_TAG:
+            session_parameters["QUERY_TAG"] = _QUERY_TAG
+        # Database, schema and session parameters are applied during login rather than
+        # with a USE/ALTER SESSION round trip each.
         connection = snowflake_connection(
-            user=self._get_user(),
-            password=self._get_password(),
+            user=self._user,
+            password=self._password,
             account=str(self.account_name),
-            role=self._get_role(),
-            warehouse=self._get_warehouse(),
-            host=self._get_host(),
-            authenticator=self._get_authenticator(),
-            passcode=self._get_mfa_passcode(),
-            passcode_in_password=self._is_mfa_passcode_in_password(),
-        )
-
-        if _QUERY_TAG:
-            connection.cursor().execute(f"ALTER SESSION SET QUERY_TAG = '{_QUERY_TAG}'")
-        connection.cursor().execute(
-            f"ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS = {env_vars.DEFAULT_SESSION_TIMEOUT_SEC}"
+            role=self._role,
+            warehouse=self._warehouse,
+            host=self._host,
+            authenticator=self._authenticator,
+            passcode=self._mfa_passcode,
+            passcode_in_password=self._mfa_passcode_in_password,
+            database=db_name,
+            schema=schema_name,
+            session_parameters=session_parameters,
         )
         return connection
 
@@ -522,34 +852,46 @@ class SnowflakeConnector:
         connection: SnowflakeConnection,
         query: str,
     ) -> Dict[str, List[Any]]:
+        # One cursor serves both the warehouse switch and the query itself.
+        cursor = connection.cursor()
         try:
             if connection.warehouse is None:
-                warehouse = self._get_warehouse()
+                warehouse = self._warehouse
                 logger.debug(
                     f"There is no Warehouse assigned to Connection, setting it to config default ({warehouse})"
                 )
                 # TODO(jhilgart): Do we need to replace - with _?
                 # Snowflake docs suggest we need identifiers with _, https://docs.snowflake.com/en/sql-reference/identifiers-syntax,
                 # but unclear if we need this here.
-                connection.cursor().execute(
-                    f'use warehouse {warehouse.replace("-", "_")}'
-                )
-            cursor = connection.cursor(DictCursor)
+                cursor.execute(f'use warehouse {warehouse.replace("-", "_")}')
             logger.info(f"Executing query = {query}")
             cursor_execute = cursor.execute(query)
             # assert below for MyPy. Should always be true.
             assert cursor_execute, "cursor_execute should not be None here"
-            result = cursor_execute.fetchall()
+            column_names = [c.name for c in cursor_execute.description]
+            try:
+                values: Dict[str, List[Any]] = {name: [] for name in column_names}
+                # Batches are converted one at a time rather than concatenated, since the
+                # same integer column can come back in a different width in each batch.
+                for batch in cursor_execute.fetch_arrow_batches():
+                    # Columns are paired by position, since names may repeat (e.g. a.id,
+                    # b.id); as with a dict cursor, the last column of a name wins.
+                    batch_values = {
+                        name: column.to_pylist()
+                        for name, column in zip(batch.column_names, batch.columns)
+                    }
+                    for name, column_values in batch_values.items():
+                        values.setdefault(name, []).extend(column_values)
+                return values
+            except NotSupportedError:
+                # Results that can't be fetched as Arrow (e.g. from DDL statements) are
+                # read row by row instead.
+                result = cursor_execute.fetchall()
         except ProgrammingError as e:
             raise ValueError(f"Query Error: {e}")
 
-        out_dict = defaultdict(list)
-        for row in result:
-            if isinstance(row, dict):
-                for k, v in row.items():
-                    out_dict[k].append(v)
-            else:
-                raise ValueError(
-                    f"Expected a dict for row object. Instead passed {row}"
-                )
-        return out_dict
+        # Rows are plain tuples, so values are looked up by column position.
+        return {
+            name: [row[i] for row in result]  # type: ignore[index]
+            for i, name in enumerate(column_names)
+        }
@@ -1,4 +1,4 @@
-from typing import Dict, Optional, Union
+from typing import Any, Dict, Optional, Union
 
 from snowflake.connector import connect
 from snowflake.connector.connection import SnowflakeConnection
@@ -30,8 +30,9 @@ def create_connection_parameters(
     authenticator: Optional[str] = None,
     passcode: Optional[str] = None,
     passcode_in_password: Optional[bool] = None,
-) -> Dict[str, Union[str, bool]]:
-    connection_parameters: Dict[str, Union[str, bool]] = dict(
+    session_parameters: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Union[str, bool, Dict[str, Any]]]:
+    connection_parameters: Dict[str, Union[str, bool, Dict[str, Any]]] = dict(
         user=user, account=account
     )
     if password:
@@ -52,11 +53,13 @@ def create_connection_parameters(
         connection_parameters["passcode"] = passcode
     if passcode_in_password:
         connection_parameters["passcode_in_password"] = passcode_in_password
+    if session_parameters:
+        connection_parameters["session_parameters"] = session_parameters
     return connection_parameters
 
 
 def _connection(
-    connection_parameters: Dict[str, Union[str, bool]]
+    connection_parameters: Dict[str, Union[str, bool, Dict[str, Any]]]
 ) -> SnowflakeConnection:
     # https://docs.snowflake.com/en/developer-guide/python-connector/python-connector-connect
     return connect(**connection_parameters)
@@ -72,9 +75,13 @@ def snowflake_connection(
     authenticator: Optional[str] = None,
     passcode: Optional[str] = None,
     passcode_in_password: Optional[bool] = None,
+    database: Optional[str] = None,
+    schema: Optional[str] = None,
+    session_parameters: Optional[Dict[str, Any]] = None,
 ) -> SnowflakeConnection:
     """
     Returns a Snowflake Connection to the specified account.
+    The database, schema and session parameters are set as part of login, without extra round trips.
     """
     return _connection(
         create_connection_parameters(
@@ -84,8 +91,11 @@ def snowflake_connection(
             account=account,
             role=role,
             warehouse=warehouse,
+            database=database,
+            schema=schema,
             authenticator=authenticator,
             passcode=passcode,
             passcode_in_password=passcode_in_password,
+            session_parameters=session_parameters,
         )
     )
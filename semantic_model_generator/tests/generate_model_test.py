@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, call, mock_open, patch
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 import yaml
 
@@ -201,6 +202,7 @@ def mock_snowflake_connection_env(monkeypatch):
 def mock_dependencies(mock_snowflake_connection):
     valid_schemas_tables_columns_df_alias = pd.DataFrame(
         {
+            "TABLE_SCHEMA": ["SCHEMA_TEST"] * 4,
             "TABLE_NAME": ["ALIAS"] * 4,
             "COLUMN_NAME": ["ZIP_CODE", "AREA_CODE", "BAD_ALIAS", "CBSA"],
             "DATA_TYPE": ["VARCHAR", "INTEGER", "DATETIME", "DECIMAL"],
@@ -208,6 +210,7 @@ def mock_dependencies(mock_snowflake_connection):
     )
     valid_schemas_tables_columns_df_zip_code = pd.DataFrame(
         {
+            "TABLE_SCHEMA": ["A_DIFFERENT_SCHEMA"],
             "TABLE_NAME": ["PRODUCTS"],
             "COLUMN_NAME": ["SKU"],
             "DATA_TYPE": ["NUMBER"],
@@ -223,8 +226,11 @@ def mock_dependencies(mock_snowflake_connection):
     ]
 
     with patch(
-        "semantic_model_generator.generate_model.get_valid_schemas_tables_columns_df",
-        side_effect=valid_schemas_tables_representations,
+        "semantic_model_generator.generate_model.iter_valid_schemas_tables_columns",
+        side_effect=[
+            iter([pa.Table.from_pandas(df)])
+            for df in valid_schemas_tables_representations
+        ],
     ), patch(
         "semantic_model_generator.generate_model.get_table_representation",
         side_effect=table_representations,
@@ -236,6 +242,7 @@ def mock_dependencies(mock_snowflake_connection):
 def mock_dependencies_new_dtype(mock_snowflake_connection):
     valid_schemas_tables_columns_df_alias = pd.DataFrame(
         {
+            "TABLE_SCHEMA": ["SCHEMA_TEST"] * 4,
             "TABLE_NAME": ["ALIAS"] * 4,
             "COLUMN_NAME": ["ZIP_CODE", "AREA_CODE", "BAD_ALIAS", "CBSA"],
             "DATA_TYPE": ["VARCHAR", "INTEGER", "DATETIME", "DECIMAL"],
@@ -243,6 +250,7 @@ def mock_dependencies_new_dtype(mock_snowflake_connection):
     )
     valid_schemas_tables_columns_df_zip_code = pd.DataFrame(
         {
+            "TABLE_SCHEMA": ["A_DIFFERENT_SCHEMA"],
             "TABLE_NAME": ["PRODUCTS"],
             "COLUMN_NAME": ["SKU"],
             "DATA_TYPE": ["NUMBER"],
@@ -257,8 +265,11 @@ def mock_dependencies_new_dtype(mock_snowflake_connection):
     ]
 
     with patch(
-        "semantic_model_generator.generate_model.get_valid_schemas_tables_columns_df",
-        side_effect=valid_schemas_tables_representations,
+        "semantic_model_generator.generate_model.iter_valid_schemas_tables_columns",
+        side_effect=[
+            iter([pa.Table.from_pandas(df)])
+            for df in valid_schemas_tables_representations
+        ],
     ), patch(
         "semantic_model_generator.generate_model.get_table_representation",
         side_effect=table_representations,
@@ -270,13 +281,15 @@ def mock_dependencies_new_dtype(mock_snowflake_connection):
 def mock_dependencies_object_dtype(mock_snowflake_connection):
     valid_schemas_tables_columns_df_alias = pd.DataFrame(
         {
-            "TABLE_NAME": ["PRODUCTS"],
+            "TABLE_SCHEMA": ["SCHEMA_TEST"],
+            "TABLE_NAME": ["ALIAS"],
             "COLUMN_NAME": ["SKU"],
             "DATA_TYPE": ["OBJECT"],
         }
     )
     valid_schemas_tables_columns_df_zip_code = pd.DataFrame(
         {
+            "TABLE_SCHEMA": ["A_DIFFERENT_SCHEMA"],
             "TABLE_NAME": ["PRODUCTS"],
             "COLUMN_NAME": ["SKU"],
             "DATA_TYPE": ["NUMBER"],
@@ -291,8 +304,11 @@ def mock_dependencies_object_dtype(mock_snowflake_connection):
     ]
 
     with patch(
-        "semantic_model_generator.generate_model.get_valid_schemas_tables_columns_df",
-        side_effect=valid_schemas_tables_representations,
+        "semantic_model_generator.generate_model.iter_valid_schemas_tables_columns",
+        side_effect=[
+            iter([pa.Table.from_pandas(df)])
+            for df in valid_schemas_tables_representations
+        ],
     ), patch(
         "semantic_model_generator.generate_model.get_table_representation",
         side_effect=table_representations,
@@ -304,13 +320,15 @@ def mock_dependencies_object_dtype(mock_snowflake_connection):
 def mock_dependencies_exceed_context(mock_snowflake_connection):
     valid_schemas_tables_columns_df_alias = pd.DataFrame(
         {
-            "TABLE_NAME": ["PRODUCTS"],
+            "TABLE_SCHEMA": ["SCHEMA_TEST"],
+            "TABLE_NAME": ["ALIAS"],
             "COLUMN_NAME": ["SKU"],
             "DATA_TYPE": ["OBJECT"],
         }
     )
     valid_schemas_tables_columns_df_zip_code = pd.DataFrame(
         {
+            "TABLE_SCHEMA": ["A_DIFFERENT_SCHEMA"],
             "TABLE_NAME": ["PRODUCTS"],
             "COLUMN_NAME": ["SKU"],
             "DATA_TYPE": ["NUMBER"],
@@ -325,8 +343,11 @@ def mock_dependencies_exceed_context(mock_snowflake_connection):
     ]
 
     with patch(
-        "semantic_model_generator.generate_model.get_valid_schemas_tables_columns_df",
-        side_effect=valid_schemas_tables_representations,
+        "semantic_model_generator.generate_model.iter_valid_schemas_tables_columns",
+        side_effect=[
+            iter([pa.Table.from_pandas(df)])
+            for df in valid_schemas_tables_representations
+        ],
     ), patch(
         "semantic_model_generator.generate_model.get_table_representation",
         side_effect=table_representations,
@@ -356,6 +377,37 @@ def test_raw_schema_to_semantic_context(
     assert result_yaml == want_yaml
 
 
+def test_raw_schema_to_semantic_context_mixed_case_schema(
+    mock_snowflake_connection, mock_snowflake_connection_env
+):
+    # Quoted schemas keep their case in the catalog, while base tables are upper-cased.
+    catalog = pa.table(
+        {
+            "TABLE_SCHEMA": ["MySchema"],
+            "TABLE_NAME": ["ALIAS"],
+            "TABLE_COMMENT": ["some table comment"],
+            "COLUMN_NAME": ["ZIP_CODE"],
+            "DATA_TYPE": ["VARCHAR"],
+            "COLUMN_COMMENT": [None],
+        }
+    )
+    with patch(
+        "semantic_model_generator.generate_model.iter_valid_schemas_tables_columns",
+        return_value=iter([catalog]),
+    ), patch(
+        "semantic_model_generator.generate_model.get_table_representation",
+        return_value=_CONVERTED_TABLE_ALIAS,
+    ) as mock_get_table_representation:
+        semantic_model = raw_schema_to_semantic_context(
+            base_tables=["test_db.MySchema.ALIAS"],
+            conn=mock_snowflake_connection,
+            semantic_model_name="mixed case schema",
+        )
+
+    assert [t.name for t in semantic_model.tables] == ["ALIAS"]
+    assert mock_get_table_representation.call_args.kwargs["columns_df"].equals(catalog)
+
+
 @patch("builtins.open", new_callable=mock_open)
 def test_generate_base_context_with_placeholder_comments(
     mock_file,
@@ -475,7 +527,7 @@ def test_generate_base_context_from_table_that_has_not_supported_dtype(
         )
     assert (
         str(excinfo.value)
-        == f"No valid columns found for table PRODUCTS. Please verify that this table contains column's datatypes not in {OBJECT_DATATYPES}."
+        == f"No valid columns found for table PRODUCTS. Please verify that this table contains column's datatypes not in {sorted(OBJECT_DATATYPES)}."
     )
 
     expected_calls = [
@@ -1,9 +1,13 @@
+import gc
+import weakref
 from unittest import mock
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import patch
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 from pandas.testing import assert_frame_equal
+from snowflake.connector.errors import NotSupportedError, ProgrammingError
 
 from semantic_model_generator.data_processing.data_types import Column, Table
 from semantic_model_generator.snowflake_utils import snowflake_connector
@@ -33,47 +37,46 @@ def mock_snowflake_connection_env(monkeypatch):
         yield
 
 
+@pytest.fixture
+def mock_conn() -> mock.MagicMock:
+    """A connection whose cursor returns itself from execute(), like SnowflakeCursor."""
+    conn = mock.MagicMock()
+    cursor = conn.cursor.return_value
+    cursor.execute.return_value = cursor
+    return conn
+
+
 @pytest.fixture
 def schemas_tables_columns() -> pd.DataFrame:
     return pd.DataFrame(
         columns=[
             "TABLE_SCHEMA",
             "TABLE_NAME",
+            "TABLE_COMMENT",
             "COLUMN_NAME",
             "DATA_TYPE",
             "COLUMN_COMMENT",
         ],
         data=[
-            ["TEST_SCHEMA_1", "table_1", "col_1", "VARCHAR", None],
-            ["TEST_SCHEMA_1", "table_1", "col_2", "NUMBER", None],
-            ["TEST_SCHEMA_1", "table_2", "col_1", "NUMBER", "table_2_col_1_comment"],
+            ["TEST_SCHEMA_1", "table_1", None, "col_1", "VARCHAR", None],
+            ["TEST_SCHEMA_1", "table_1", None, "col_2", "NUMBER", None],
             [
                 "TEST_SCHEMA_1",
                 "table_2",
+                "table_2_comment",
+                "col_1",
+                "NUMBER",
+                "table_2_col_1_comment",
+            ],
+            [
+                "TEST_SCHEMA_1",
+                "table_2",
+                "table_2_comment",
                 "col_2",
                 "TIMESTAMP_NTZ",
                 "table_2_col_2_comment",
             ],
-            ["TEST_SCHEMA_2", "table_3", "col_1", "VARIANT", None],
-            [
-                "TEST_SCHEMA_2",
-                "invalid_table",
-                "col_1",
-                "VARIANT",
-                "invalid_table_col_1_comment",
-            ],
-        ],
-    )
-
-
-@pytest.fixture
-def valid_tables() -> pd.DataFrame:
-    return pd.DataFrame(
-        columns=["TABLE_SCHEMA", "TABLE_NAME", "TABLE_COMMENT"],
-        data=[
-            ["TEST_SCHEMA_1", "table_1", None],
-            ["TEST_SCHEMA_1", "table_2", "table_2_comment"],
-            ["TEST_SCHEMA_2", "table_3", "table_3_comment"],
+            ["TEST_SCHEMA_2", "table_3", "table_3_comment", "col_1", "VARIANT", None],
         ],
     )
 
@@ -112,12 +115,15 @@ def test_connect(
     with connector.connect(db_name="test") as conn:
         pass
 
-    conn.cursor().execute.assert_has_calls(
-        [
-            call("ALTER SESSION SET QUERY_TAG = 'SEMANTIC_MODEL_GENERATOR'"),
-            call("ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS = 120"),
-        ]
-    )
+    _, kwargs = mock_snowflake_connection.call_args
+    assert kwargs["database"] == "test"
+    assert kwargs["schema"] is None
+    assert kwargs["session_parameters"] == {
+        "QUERY_TAG": "SEMANTIC_MODEL_GENERATOR",
+        "STATEMENT_TIMEOUT_IN_SECONDS": 120,
+    }
+    # Session setup happens during login, so no statements are run on connect.
+    conn.cursor().execute.assert_not_called()
     conn.close.assert_called_with()
 
 
@@ -135,36 +141,39 @@ def test_connect_with_schema(
     with connector.connect(db_name="test_db", schema_name="test_schema") as conn:
         pass
 
-    conn.cursor().execute.assert_has_calls(
-        [
-            call("ALTER SESSION SET QUERY_TAG = 'SEMANTIC_MODEL_GENERATOR'"),
-            call("ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS = 120"),
-        ]
-    )
+    _, kwargs = mock_snowflake_connection.call_args
+    assert kwargs["database"] == "test_db"
+    assert kwargs["schema"] == "test_schema"
+    assert kwargs["session_parameters"] == {
+        "QUERY_TAG": "SEMANTIC_MODEL_GENERATOR",
+        "STATEMENT_TIMEOUT_IN_SECONDS": 120,
+    }
+    conn.cursor().execute.assert_not_called()
     conn.close.assert_called_with()
 
 
-@mock.patch(
-    "semantic_model_generator.snowflake_utils.snowflake_connector._fetch_valid_tables_and_views"
-)
 @mock.patch(
     "semantic_model_generator.snowflake_utils.snowflake_connector.snowflake_connection"
 )
 def test_get_valid_schema_table_columns_df(
     mock_snowflake_connection: mock.MagicMock,
-    mock_valid_tables: mock.MagicMock,
-    valid_tables: pd.DataFrame,
     schemas_tables_columns: pd.DataFrame,
 ):
     mock_conn = mock.MagicMock()
     # We expect get_database_representation() to execute queries in this order:
     # - select from information_schema.tables
     # - select from information_schema.columns for each table.
-    mock_conn.cursor().execute().fetch_pandas_all.side_effect = [
-        schemas_tables_columns[schemas_tables_columns["TABLE_NAME"] == "table_1"]
+    table_1_columns = schemas_tables_columns[
+        schemas_tables_columns["TABLE_NAME"] == "table_1"
     ]
+    # Results arrive in two batches.
+    mock_conn.cursor().execute().fetch_arrow_batches.return_value = iter(
+        [
+            pa.Table.from_pandas(table_1_columns.iloc[:1], preserve_index=False),
+            pa.Table.from_pandas(table_1_columns.iloc[1:], preserve_index=False),
+        ]
+    )
     mock_snowflake_connection.return_value = mock_conn
-    mock_valid_tables.return_value = valid_tables
 
     got = snowflake_connector.get_valid_schemas_tables_columns_df(
         mock_conn, "TEST_DB", "TEST_SCHEMA_1", ["table_1"]
@@ -185,60 +194,371 @@ def test_get_valid_schema_table_columns_df(
     assert_frame_equal(want, got)
 
     # Assert that the connection executed the expected queries.
-    query = "select t.TABLE_SCHEMA, t.TABLE_NAME, c.COLUMN_NAME, c.DATA_TYPE, c.COMMENT as COLUMN_COMMENT\nfrom TEST_DB.information_schema.tables as t\njoin TEST_DB.information_schema.columns as c on t.table_schema = c.table_schema and t.table_name = c.table_name where t.table_schema ilike 'TEST_SCHEMA_1' AND LOWER(t.table_name) in ('table_1') \norder by 1, 2, c.ordinal_position"
-    mock_conn.cursor().execute.assert_any_call(query)
+    query = "select t.TABLE_SCHEMA, t.TABLE_NAME, t.COMMENT as TABLE_COMMENT, c.COLUMN_NAME, c.DATA_TYPE, c.COMMENT as COLUMN_COMMENT\nfrom TEST_DB.information_schema.tables as t\njoin TEST_DB.information_schema.columns as c on t.table_schema = c.table_schema and t.table_name = c.table_name where t.table_schema ilike %s AND LOWER(t.table_name) in (%s) \norder by 1, 2, c.ordinal_position"
+    mock_conn.cursor().execute.assert_any_call(query, ["TEST_SCHEMA_1", "table_1"])
 
 
-@pytest.fixture
-def snowflake_data():
-    return [
-        # This mimics the return value of cursor.fetchall() for tables and views
-        ([("table1", "schema1", "A table comment")], [("column1", "dtype")]),
-        ([("view1", "schema1", "A view comment")], [("column1", "dtype")]),
-    ]
+def test_get_column_values():
+    mock_conn = mock.MagicMock()
+    mock_conn.cursor().execute().fetch_arrow_all.return_value = pa.table(
+        {
+            "COLUMN_INDEX": [1, 0, 1, 0],
+            "COLUMN_RANK": [0, 1, 1, 0],
+            "COLUMN_VALUE": ["1", "b", None, "a"],
+        }
+    )
+    got = snowflake_connector._get_column_values(
+        mock_conn,
+        "TEST_DB.TEST_SCHEMA_1",
+        "table_1",
+        column_names=["col_1", "col_2", "col_3"],
+        column_datatypes=["VARCHAR", "NUMBER", "VARIANT"],
+        ndv=2,
+    )
 
+    # Values come back most frequent first, whatever order the rows arrive in.
+    assert got == {0: ["a", "b"], 1: ["1"]}
+    # VARIANT columns are not sampled, so a single query covers the two remaining columns.
+    query = """with top_k as (select approx_top_k(substr(to_varchar("col_1"), 1, 256), 2) as top_k_0, approx_top_k(substr(to_varchar("col_2"), 1, 256), 2) as top_k_1 from TEST_DB.TEST_SCHEMA_1.table_1)
+select 0 as COLUMN_INDEX, f.index as COLUMN_RANK, f.value[0]::varchar as COLUMN_VALUE from top_k, lateral flatten(input => top_k.top_k_0) as f
+union all
+select 1 as COLUMN_INDEX, f.index as COLUMN_RANK, f.value[0]::varchar as COLUMN_VALUE from top_k, lateral flatten(input => top_k.top_k_1) as f"""
+    mock_conn.cursor().execute.assert_called_with(query)
 
-@pytest.fixture
-def expected_df():
-    # Expected DataFrame structure based on mocked fetchall data
-    return pd.DataFrame(
+
+def test_get_column_values_falls_back_per_column():
+    mock_conn = mock.MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.execute.side_effect = [
+        ProgrammingError("cannot cast col_2"),
+        mock_cursor,
+        ProgrammingError("cannot cast col_2"),
+    ]
+    mock_cursor.fetch_arrow_all.return_value = pa.table(
         {
-            snowflake_connector._TABLE_NAME_COL: ["table1", "view1"],
-            snowflake_connector._TABLE_SCHEMA_COL: ["schema1", "schema1"],
-            snowflake_connector._TABLE_COMMENT_COL: [
-                "A table comment",
-                "A view comment",
-            ],
+            "COLUMN_INDEX": pa.array([0, 0], pa.int8()),
+            "COLUMN_RANK": pa.array([0, 1], pa.int8()),
+            "COLUMN_VALUE": ["a", "b"],
         }
     )
 
+    got = snowflake_connector._get_column_values(
+        mock_conn,
+        "TEST_DB.TEST_SCHEMA_1",
+        "table_1",
+        column_names=["col_1", "col_2", "col_3"],
+        column_datatypes=["VARCHAR", "NUMBER", "VECTOR"],
+        ndv=2,
+    )
+
+    # Only the column whose own query failed goes without values.
+    assert got == {0: ["a", "b"]}
+    assert mock_cursor.execute.call_count == 3
+
 
-def test_fetch_valid_tables_and_views(snowflake_data, expected_df):
-    # Mock SnowflakeConnection and cursor
+def test_get_column_values_no_samples():
     mock_conn = mock.MagicMock()
+
+    got = snowflake_connector._get_column_values(
+        mock_conn,
+        "TEST_DB.TEST_SCHEMA_1",
+        "table_1",
+        column_names=["col_1", "col_2"],
+        column_datatypes=["VARCHAR", "NUMBER"],
+        ndv=0,
+    )
+
+    assert got == {}
+    mock_conn.cursor().execute.assert_not_called()
+
+
+def test_execute(mock_conn: mock.MagicMock, mock_snowflake_connection_env):
     mock_cursor = mock_conn.cursor.return_value
-    mock_cursor.execute.return_value = mock_cursor
-    # Set side effects for fetchall and description based on snowflake_data fixture
-    mock_cursor.fetchall.side_effect = [snowflake_data[0][0], snowflake_data[1][0]]
+    mock_cursor.fetch_arrow_batches.return_value = iter(
+        [
+            pa.table({"COL_1": ["a"], "COL_2": [1]}),
+            pa.table({"COL_1": ["b"], "COL_2": [2]}),
+        ]
+    )
+
+    connector = snowflake_connector.SnowflakeConnector(account_name="test_account")
+    got = connector.execute(mock_conn, "select * from test_table")
+
+    assert got == {"COL_1": ["a", "b"], "COL_2": [1, 2]}
+    mock_cursor.fetchall.assert_not_called()
+
+
+def test_execute_integer_batches_of_different_widths(
+    mock_conn: mock.MagicMock, mock_snowflake_connection_env
+):
+    mock_cursor = mock_conn.cursor.return_value
+    # Integer columns keep each chunk's own width, so batches of one result can disagree.
+    mock_cursor.fetch_arrow_batches.return_value = iter(
+        [
+            pa.table({"COL_1": pa.array([1], pa.int8())}),
+            pa.table({"COL_1": pa.array([300], pa.int16())}),
+        ]
+    )
+
+    connector = snowflake_connector.SnowflakeConnector(account_name="test_account")
+    got = connector.execute(mock_conn, "select * from test_table")
+
+    assert got == {"COL_1": [1, 300]}
+
+
+def test_execute_duplicate_column_names(
+    mock_conn: mock.MagicMock, mock_snowflake_connection_env
+):
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetch_arrow_batches.return_value = iter(
+        [pa.Table.from_arrays([pa.array([1]), pa.array([2])], names=["ID", "ID"])]
+    )
+
+    connector = snowflake_connector.SnowflakeConnector(account_name="test_account")
+    got = connector.execute(mock_conn, "select a.id, b.id from a join b")
+
+    assert got == {"ID": [2]}
+
+
+def test_execute_non_arrow_result(
+    mock_conn: mock.MagicMock, mock_snowflake_connection_env
+):
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetch_arrow_batches.side_effect = NotSupportedError
+    mock_cursor.fetchall.return_value = [("Statement executed successfully.",)]
+    mock_status = mock.MagicMock()
+    mock_status.name = "status"
+    mock_cursor.description = [mock_status]
+
+    connector = snowflake_connector.SnowflakeConnector(account_name="test_account")
+    got = connector.execute(mock_conn, "create table test_table (col_1 int)")
+
+    assert got == {"status": ["Statement executed successfully."]}
+    mock_cursor.execute.assert_called_once_with("create table test_table (col_1 int)")
+
+
+def test_execute_sets_warehouse_on_same_cursor(
+    mock_conn: mock.MagicMock, mock_snowflake_connection_env
+):
+    mock_conn.warehouse = None
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetch_arrow_batches.return_value = iter([pa.table({"COL_1": ["a"]})])
+
+    connector = snowflake_connector.SnowflakeConnector(account_name="test_account")
+    got = connector.execute(mock_conn, "select * from test_table")
+
+    assert got == {"COL_1": ["a"]}
+    mock_conn.cursor.assert_called_once_with()
+    assert mock_cursor.execute.call_args_list == [
+        mock.call("use warehouse test_warehouse"),
+        mock.call("select * from test_table"),
+    ]
+
+
+def test_get_table_representation(schemas_tables_columns):
+    mock_conn = mock.MagicMock()
+    columns = pa.Table.from_pandas(
+        schemas_tables_columns[schemas_tables_columns["TABLE_NAME"] == "table_2"],
+        preserve_index=False,
+    )
+
+    got = snowflake_connector.get_table_representation(
+        mock_conn,
+        schema_name="TEST_DB.TEST_SCHEMA_1",
+        table_name="table_2",
+        table_index=0,
+        ndv_per_column=0,
+        columns_df=columns,
+        max_workers=2,
+    )
+    # Dataframes are still accepted.
+    got_from_df = snowflake_connector.get_table_representation(
+        mock_conn,
+        schema_name="TEST_DB.TEST_SCHEMA_1",
+        table_name="table_2",
+        table_index=0,
+        ndv_per_column=0,
+        columns_df=columns.to_pandas(),
+        max_workers=2,
+    )
+
+    want = Table(
+        id_=0,
+        name="table_2",
+        comment="table_2_comment",
+        columns=[
+            Column(
+                id_=0,
+                column_name="col_1",
+                column_type="NUMBER",
+                comment="table_2_col_1_comment",
+            ),
+            Column(
+                id_=1,
+                column_name="col_2",
+                column_type="TIMESTAMP_NTZ",
+                comment="table_2_col_2_comment",
+            ),
+        ],
+    )
+    assert got == want
+    assert got_from_df == want
+    # Comments and sample values are not needed, so no queries are issued.
+    mock_conn.cursor().execute.assert_not_called()
 
-    mock_name_one = MagicMock()
-    mock_name_one.name = "name"
-    mock_name_two = MagicMock()
-    mock_name_two.name = "schema_name"
-    mock_name_three = MagicMock()
-    mock_name_three.name = "comment"
 
-    mocked_descriptions = [mock_name_one, mock_name_two, mock_name_three]
-    mock_cursor.description = mocked_descriptions
+def test_connector_requires_env_vars(monkeypatch):
+    monkeypatch.setattr(snowflake_connector.env_vars, "SNOWFLAKE_ROLE", None)
 
-    # Call the function to test
-    result_df = snowflake_connector._fetch_valid_tables_and_views(mock_conn, "mock_db")
+    # Missing env vars are reported when the connector is created, not on first connect.
+    with pytest.raises(ValueError, match="SNOWFLAKE_ROLE"):
+        snowflake_connector.SnowflakeConnector(account_name="test_account")
 
-    # Assert the result is as expected
-    pd.testing.assert_frame_equal(
-        result_df.reset_index(drop=True), expected_df.reset_index(drop=True)
+
+@mock.patch(
+    "semantic_model_generator.snowflake_utils.snowflake_connector.snowflake_connection"
+)
+def test_connect_reuses_pooled_connection(
+    mock_snowflake_connection: mock.MagicMock, mock_snowflake_connection_env
+):
+    mock_snowflake_connection.side_effect = lambda **_: mock.MagicMock(
+        **{"is_closed.return_value": False}
     )
 
-    # Verify execute was called with correct queries
-    mock_cursor.execute.assert_any_call("show tables in database mock_db")
-    mock_cursor.execute.assert_any_call("show views in database mock_db")
+    connector = snowflake_connector.SnowflakeConnector(
+        account_name="test_account", pool_size=1
+    )
+    with connector.connect(db_name="test_db") as conn_1:
+        pass
+    with connector.connect(db_name="test_db") as conn_2:
+        pass
+    with connector.connect(db_name="other_db") as conn_3:
+        pass
+
+    assert conn_1 is conn_2
+    assert conn_1 is not conn_3
+    assert mock_snowflake_connection.call_count == 2
+    conn_1.close.assert_not_called()
+
+    connector.close_all()
+    conn_1.close.assert_called_with()
+    conn_3.close.assert_called_with()
+
+
+@mock.patch(
+    "semantic_model_generator.snowflake_utils.snowflake_connector.snowflake_connection"
+)
+def test_connect_closes_connection_on_error(
+    mock_snowflake_connection: mock.MagicMock, mock_snowflake_connection_env
+):
+    mock_snowflake_connection.side_effect = lambda **_: mock.MagicMock(
+        **{"is_closed.return_value": False}
+    )
+
+    connector = snowflake_connector.SnowflakeConnector(
+        account_name="test_account", pool_size=1
+    )
+    with pytest.raises(ValueError):
+        with connector.connect(db_name="test_db") as conn_1:
+            raise ValueError("query failed")
+    with connector.connect(db_name="test_db") as conn_2:
+        pass
+
+    # A connection the block failed on is closed rather than handed to the next caller.
+    conn_1.close.assert_called_with()
+    assert conn_1 is not conn_2
+
+    # Pooled connectors are only weakly registered for closing at exit.
+    connector_ref = weakref.ref(connector)
+    del connector
+    gc.collect()
+    assert connector_ref() is None
+
+
+def test_fetch_tables_views_in_schema():
+    mock_conn = mock.MagicMock()
+    results = {
+        "show tables in schema TEST_DB.TEST_SCHEMA;": [
+            ("created_on", "TABLE_1", "TEST_DB", "TEST_SCHEMA")
+        ],
+        "show views in schema TEST_DB.TEST_SCHEMA;": [
+            ("created_on", "VIEW_1", "", "TEST_DB", "TEST_SCHEMA")
+        ],
+    }
+
+    def _cursor() -> mock.MagicMock:
+        cursor = mock.MagicMock()
+        cursor.execute.side_effect = lambda query: cursor.fetchall.configure_mock(
+            return_value=results[query]
+        )
+        return cursor
+
+    mock_conn.cursor.side_effect = _cursor
+
+    got = snowflake_connector.fetch_tables_views_in_schema(
+        mock_conn, "TEST_DB.TEST_SCHEMA"
+    )
+
+    assert got == ["TEST_DB.TEST_SCHEMA.TABLE_1", "TEST_DB.TEST_SCHEMA.VIEW_1"]
+
+
+def test_get_valid_schema_table_columns_df_qmark(schemas_tables_columns):
+    mock_conn = mock.MagicMock()
+    mock_conn.is_pyformat = False
+    mock_conn.cursor().execute().fetch_arrow_batches.return_value = iter(
+        [pa.Table.from_pandas(schemas_tables_columns, preserve_index=False)]
+    )
+
+    snowflake_connector.get_valid_schemas_tables_columns_df(
+        mock_conn, "TEST_DB", "TEST_SCHEMA_1", ["table_1", "TABLE_2"]
+    )
+
+    query = "select t.TABLE_SCHEMA, t.TABLE_NAME, t.COMMENT as TABLE_COMMENT, c.COLUMN_NAME, c.DATA_TYPE, c.COMMENT as COLUMN_COMMENT\nfrom TEST_DB.information_schema.tables as t\njoin TEST_DB.information_schema.columns as c on t.table_schema = c.table_schema and t.table_name = c.table_name where t.table_schema ilike ? AND LOWER(t.table_name) in (?, ?) \norder by 1, 2, c.ordinal_position"
+    mock_conn.cursor().execute.assert_any_call(
+        query, ["TEST_SCHEMA_1", "table_1", "table_2"]
+    )
+
+
+def test_iter_tables(schemas_tables_columns):
+    # Rows of a table don't need to be contiguous.
+    columns = pa.Table.from_pandas(
+        schemas_tables_columns.iloc[[0, 2, 1, 4, 3]], preserve_index=False
+    )
+
+    got = [
+        (schema_name, table_name, table_columns.column("COLUMN_NAME").to_pylist())
+        for schema_name, table_name, table_columns in snowflake_connector.iter_tables(
+            columns
+        )
+    ]
+
+    assert got == [
+        ("TEST_SCHEMA_1", "table_1", ["col_1", "col_2"]),
+        ("TEST_SCHEMA_1", "table_2", ["col_1", "col_2"]),
+        ("TEST_SCHEMA_2", "table_3", ["col_1"]),
+    ]
+
+
+def test_iter_valid_schemas_tables_columns(schemas_tables_columns):
+    mock_conn = mock.MagicMock()
+    mock_conn.is_pyformat = False
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.execute.return_value = mock_cursor
+    columns = pa.Table.from_pandas(schemas_tables_columns, preserve_index=False)
+    # table_1 ends exactly at the first batch, table_2 is split across the second and third.
+    mock_cursor.fetch_arrow_batches.return_value = iter(
+        [columns.slice(0, 2), columns.slice(2, 1), columns.slice(3, 2)]
+    )
+
+    got = [
+        page.column("TABLE_NAME").to_pylist()
+        for page in snowflake_connector.iter_valid_schemas_tables_columns(
+            mock_conn, "TEST_DB"
+        )
+    ]
+
+    # Rows of a table that may continue in the next batch are held back until it arrives.
+    assert got == [["table_1", "table_1"], ["table_2", "table_2"], ["table_3"]]
+    # The catalog is queried once and streamed.
+    query = "select t.TABLE_SCHEMA, t.TABLE_NAME, t.COMMENT as TABLE_COMMENT, c.COLUMN_NAME, c.DATA_TYPE, c.COMMENT as COLUMN_COMMENT\nfrom TEST_DB.information_schema.tables as t\njoin TEST_DB.information_schema.columns as c on t.table_schema = c.table_schema and t.table_name = c.table_name\norder by 1, 2, c.ordinal_position"
+    mock_cursor.execute.assert_called_once_with(query, None)